@@ -1,10 +1,20 @@
 import os
 import json
+import asyncio
+import threading
+import hashlib
+from collections import OrderedDict
 import google.generativeai as genai
-from typing import List, Tuple
+from datetime import date, datetime
+from typing import Callable, List, Optional, Tuple
 from dotenv import load_dotenv
 from models import Task, Project, TaskStatus
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 load_dotenv()
 
 API_KEY = os.getenv("GEMINI_API_KEY")
@@ -14,83 +24,282 @@ if not API_KEY:
 else:
     genai.configure(api_key=API_KEY)
 
-def process_brain_dump(text: str) -> Tuple[List[Task], List[Project]]:
+MODEL_NAME = 'gemini-2.0-flash-exp'
+
+# Model construction is not free, so build it once and reuse it across calls.
+_MODEL = None
+_MODEL_LOCK = threading.Lock()
+
+def get_model():
+    """
+    Returns the shared GenerativeModel instance, creating it on first use.
+    """
+    global _MODEL
+    if _MODEL is None:
+        with _MODEL_LOCK:
+            if _MODEL is None:
+                _MODEL = genai.GenerativeModel(MODEL_NAME)
+    return _MODEL
+
+# Raw Gemini responses are cached by brain dump text so repeated ingests skip the API call.
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".pomodoro_cache", "gemini")
+MAX_CACHED_RESPONSES = 128
+# Bump whenever the prompt, the tool declarations or the cached format change,
+# so responses cached for the old shape are no longer hit
+CACHE_VERSION = 1
+# key -> response text, least recently used first
+_RESPONSE_CACHE = OrderedDict()
+
+def _cache_key(text: str) -> str:
+    # Relative deadlines ("tomorrow") depend on the current date, so it is part of the key.
+    payload = f"{CACHE_VERSION}\n{date.today().isoformat()}\n{text}"
+    return hashlib.blake2b(payload.encode()).hexdigest()
+
+def _remember(key: str, response_text: str):
+    _RESPONSE_CACHE[key] = response_text
+    _RESPONSE_CACHE.move_to_end(key)
+    if len(_RESPONSE_CACHE) > MAX_CACHED_RESPONSES:
+        _RESPONSE_CACHE.popitem(last=False)
+
+def _get_cached_response(key: str) -> Optional[str]:
+    if key in _RESPONSE_CACHE:
+        _RESPONSE_CACHE.move_to_end(key)
+        return _RESPONSE_CACHE[key]
+    filepath = os.path.join(CACHE_DIR, f"{key}.json")
+    if not os.path.exists(filepath):
+        return None
+    try:
+        with open(filepath, 'r') as f:
+            response_text = json.load(f)["response"]
+    except (OSError, ValueError, KeyError):
+        return None
+    _remember(key, response_text)
+    return response_text
+
+def _prune_disk_cache():
+    """
+    Drops cache files from earlier days, which today's keys can never hit,
+    then the oldest files beyond MAX_CACHED_RESPONSES.
+    """
+    today_start = datetime.combine(date.today(), datetime.min.time()).timestamp()
+    entries = []
+    with os.scandir(CACHE_DIR) as it:
+        for entry in it:
+            if not entry.name.endswith(".json"):
+                continue
+            mtime = entry.stat().st_mtime
+            if mtime < today_start:
+                os.remove(entry.path)
+            else:
+                entries.append((mtime, entry.path))
+    if len(entries) > MAX_CACHED_RESPONSES:
+        entries.sort()
+        for _, path in entries[:len(entries) - MAX_CACHED_RESPONSES]:
+            os.remove(path)
+
+def _set_cached_response(key: str, response_text: str):
+    _remember(key, response_text)
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(os.path.join(CACHE_DIR, f"{key}.json"), 'w') as f:
+            json.dump({"response": response_text}, f)
+        _prune_disk_cache()
+    except OSError:
+        pass # The cache is best-effort
+
+# Built once at import; the brain dump is substituted in with str.replace.
+# The output shape comes from the tool declarations, so the prompt doesn't spell it out.
+_PROMPT_TEMPLATE = """Split this brain dump into individual, actionable tasks.
+Call create_project once per project (theme) and create_task once per task. Estimate effort in Tomatoes (1 Tomato = 25 minutes); assign each task to a project, creating one or using "General" if none fits; convert any deadline ("by Friday", "tomorrow") to YYYY-MM-DD, else omit it. Today is {today}.
+
+Brain dump:
+"{text}"
+"""
+
+CREATE_PROJECT = {
+    "name": "create_project",
+    "description": "Create a project (theme) that tasks can belong to.",
+    "parameters": {
+        "type": "OBJECT",
+        "properties": {
+            "name": {"type": "STRING"},
+            "description": {"type": "STRING"},
+        },
+        "required": ["name"],
+    },
+}
+
+CREATE_TASK = {
+    "name": "create_task",
+    "description": "Create one actionable task.",
+    "parameters": {
+        "type": "OBJECT",
+        "properties": {
+            "title": {"type": "STRING"},
+            "estimated_tomatoes": {"type": "INTEGER"},
+            "project_name": {"type": "STRING"},
+            "deadline": {"type": "STRING", "description": "YYYY-MM-DD"},
+        },
+        "required": ["title", "estimated_tomatoes", "project_name"],
+    },
+}
+
+# Gemini answers with typed function calls: no markdown fences or free-form JSON to clean up
+TOOLS = [{"function_declarations": [CREATE_PROJECT, CREATE_TASK]}]
+TOOL_CONFIG = {"function_calling_config": {"mode": "ANY"}}
+
+def _build_prompt(text: str) -> str:
+    return _PROMPT_TEMPLATE.replace("{today}", date.today().isoformat()).replace("{text}", text)
+
+def _collect_calls(parts, data: dict) -> int:
+    """
+    Appends the args of create_project/create_task calls in parts to data.
+    Returns the number of calls collected.
+    """
+    count = 0
+    for part in parts:
+        call = part.function_call
+        if call.name == "create_project":
+            data["projects"].append(dict(call.args))
+        elif call.name == "create_task":
+            data["tasks"].append(dict(call.args))
+        else:
+            continue
+        count += 1
+    return count
+
+def _no_calls_error(prompt_feedback) -> ValueError:
+    """
+    The error for a response that ended without any function calls,
+    naming the block reason when a safety filter stopped the prompt.
+    """
+    block_reason = getattr(prompt_feedback, "block_reason", None)
+    if block_reason: # 0 is BLOCK_REASON_UNSPECIFIED, i.e. not blocked
+        return ValueError(f"Gemini blocked the brain dump ({getattr(block_reason, 'name', block_reason)}).")
+    return ValueError("Gemini returned no tasks or projects.")
+
+def _parse_response(raw_text: str) -> Tuple[List[Task], List[Project]]:
+    """
+    Turns cached response text into Task and Project objects.
+    """
+    if orjson is not None:
+        data = orjson.loads(raw_text.encode())
+    else:
+        data = json.loads(raw_text)
+    return _build_objects(data)
+
+def _build_objects(data: dict) -> Tuple[List[Task], List[Project]]:
+    """
+    Turns {"projects": [...], "tasks": [...]} into Task and Project objects.
+    """
+    # One timestamp for the whole batch instead of a now() per object
+    created_at = datetime.now().isoformat()
+    
+    # Create Project objects
+    projects = [Project(name=p_data["name"], description=p_data.get("description", ""), created_at=created_at) for p_data in data.get("projects", [])]
+    projects_map = {p.name: p.id for p in projects}
+
+    # Create Task objects
+    # If the project isn't found (edge case) project_id is left as None;
+    # create_task requires a project_name, so Gemini should always name a listed project.
+    tasks = [
+        Task(
+            title=t_data["title"],
+            description=t_data.get("description", ""),
+            estimated_tomatoes=int(t_data.get("estimated_tomatoes", 1)),
+            project_id=projects_map.get(t_data.get("project_name")),
+            deadline=t_data.get("deadline"),
+            created_at=created_at
+        )
+        for t_data in data.get("tasks", [])
+    ]
+        
+    return tasks, projects
+
+def process_brain_dump(text: str, on_progress: Optional[Callable[[int], None]] = None) -> Tuple[List[Task], List[Project]]:
     """
     Takes a raw brain dump text and uses Gemini to parse it into tasks and projects.
+    The response is streamed; on_progress, if given, is called with the number of
+    projects and tasks received so far after each chunk.
     """
     if not API_KEY:
         raise ValueError("GEMINI_API_KEY not found in environment variables.")
 
-    model = genai.GenerativeModel('gemini-2.0-flash-exp')
-
-    prompt = f"""
-    You are a helpful project manager.
-    I will give you a "brain dump" of tasks.
-    Your job is to:
-    1. Break down the brain dump into individual, actionable tasks.
-    2. Estimate the effort for each task in "Tomatoes" (1 Tomato = 25 minutes).
-    3. Assign each task to a Project (Theme). If no project fits, create a new one or use "General".
-    4. Extract any deadlines mentioned (e.g., "by Friday", "tomorrow") and convert them to YYYY-MM-DD format. If no deadline, leave null.
-
-    Output valid JSON with the following structure:
-    {{
-        "projects": [
-            {{ "name": "Project Name", "description": "Optional description" }}
-        ],
-        "tasks": [
-            {{ "title": "Task Title", "estimated_tomatoes": 1, "project_name": "Project Name", "deadline": "YYYY-MM-DD or null" }}
-        ]
-    }}
-
-    Here is the brain dump:
-    "{text}"
-    
-    Return ONLY valid JSON. Do not include markdown formatting like ```json ... ```.
-    """
+    model = get_model()
 
     try:
-        response = model.generate_content(prompt)
-        response_text = response.text.strip()
-        
-        # Clean up potential markdown formatting if Gemini adds it despite instructions
-        if response_text.startswith("```json"):
-            response_text = response_text[7:]
-        if response_text.endswith("```"):
-            response_text = response_text[:-3]
+        cache_key = _cache_key(text)
+        cached_text = _get_cached_response(cache_key)
+        if cached_text is not None:
+            return _parse_response(cached_text)
             
-        data = json.loads(response_text)
+        data = {"projects": [], "tasks": []}
+        received = 0
+        prompt_feedback = None
+        for chunk in model.generate_content(_build_prompt(text), stream=True, tools=TOOLS, tool_config=TOOL_CONFIG):
+            if not chunk.candidates:
+                # A usage-only trailer or a blocked prompt; .parts would raise on it
+                prompt_feedback = chunk.prompt_feedback or prompt_feedback
+                continue
+            received += _collect_calls(chunk.parts, data)
+            if on_progress:
+                on_progress(received)
+        if not received:
+            raise _no_calls_error(prompt_feedback)
+            
+        result = _build_objects(data)
         
-        projects_map = {}
-        projects = []
-        tasks = []
-
-        # Create Project objects
-        for p_data in data.get("projects", []):
-            project = Project(name=p_data["name"], description=p_data.get("description", ""))
-            projects.append(project)
-            projects_map[project.name] = project.id
-
-        # Create Task objects
-        for t_data in data.get("tasks", []):
-            project_name = t_data.get("project_name")
-            project_id = projects_map.get(project_name)
+        # Only cache responses that parsed cleanly
+        _set_cached_response(cache_key, json.dumps(data))
             
-            # If project not found (edge case), maybe create a default one or leave None
-            # For now, let's assume Gemini follows instructions. 
-            # If not, we could create a "Misc" project.
+        return result
+
+    except Exception as e:
+        # In a real app, we'd want better error handling
+        print(f"Error calling Gemini: {e}")
+        raise e
+
+# Upper bound on in-flight Gemini requests when processing several dumps at once
+MAX_CONCURRENT_REQUESTS = 8
+
+async def process_brain_dump_async(text: str, semaphore: Optional[asyncio.Semaphore] = None) -> Tuple[List[Task], List[Project]]:
+    """
+    Async variant of process_brain_dump, so several dumps can wait on Gemini at the same time.
+    """
+    if not API_KEY:
+        raise ValueError("GEMINI_API_KEY not found in environment variables.")
+
+    model = get_model()
+
+    try:
+        cache_key = _cache_key(text)
+        cached_text = _get_cached_response(cache_key)
+        if cached_text is not None:
+            return _parse_response(cached_text)
             
-            task = Task(
-                title=t_data["title"],
-                description=t_data.get("description", ""),
-                estimated_tomatoes=int(t_data.get("estimated_tomatoes", 1)),
-                project_id=project_id,
-                deadline=t_data.get("deadline")
-            )
-            tasks.append(task)
+        if semaphore is None:
+            response = await model.generate_content_async(_build_prompt(text), tools=TOOLS, tool_config=TOOL_CONFIG)
+        else:
+            async with semaphore:
+                response = await model.generate_content_async(_build_prompt(text), tools=TOOLS, tool_config=TOOL_CONFIG)
+                
+        data = {"projects": [], "tasks": []}
+        if not response.candidates or not _collect_calls(response.parts, data):
+            raise _no_calls_error(response.prompt_feedback)
+        result = _build_objects(data)
+        
+        _set_cached_response(cache_key, json.dumps(data))
             
-        return tasks, projects
+        return result
 
     except Exception as e:
-        # In a real app, we'd want better error handling
         print(f"Error calling Gemini: {e}")
         raise e
+
+async def process_many(texts: List[str]) -> List[Tuple[List[Task], List[Project]]]:
+    """
+    Processes several brain dumps concurrently.
+    Returns one (tasks, projects) tuple per input text, in the same order.
+    """
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    return await asyncio.gather(*(process_brain_dump_async(t, semaphore) for t in texts))
@@ -1,46 +1,146 @@
 import os
-from github import Github, Auth
+import json
+import base64
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlparse
 from dotenv import load_dotenv
-from typing import List, Tuple
+from datetime import datetime
+from typing import Dict, List, Tuple
 
 load_dotenv()
 
-def get_github_client():
+GITHUB_API_URL = "https://api.github.com"
+ISSUES_PER_PAGE = 100
+MAX_PAGE_WORKERS = 8
+
+# One session per thread: repeated calls on a thread reuse its connection, and the
+# page/close workers never share a Session, which requests doesn't promise is thread-safe
+_SESSIONS = threading.local()
+
+def _get_session():
+    session = getattr(_SESSIONS, "session", None)
+    if session is not None:
+        return session
     token = os.getenv("GITHUB_TOKEN")
     if not token:
         return None
-    auth = Auth.Token(token)
-    return Github(auth=auth)
+    import requests
+    session = requests.Session()
+    session.headers.update({
+        "Authorization": f"Bearer {token}",
+        "Accept": "application/vnd.github+json",
+    })
+    _SESSIONS.session = session
+    return session
+
+# Per-page ETags and results, so unchanged pages come back as a cheap 304
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".pomodoro_cache", "github")
+
+def _cache_path(repo_name: str, label: str = None) -> str:
+    filename = f"{repo_name.replace('/', '_')}_{label or 'all'}.json"
+    return os.path.join(CACHE_DIR, filename)
+
+def _load_cache(filepath: str) -> Dict:
+    try:
+        with open(filepath, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"pages": {}}
+
+def _save_cache(filepath: str, cache: Dict):
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(filepath, 'w') as f:
+            json.dump(cache, f)
+    except OSError:
+        pass # The cache is best-effort
+
+def _check_rate_limit(response):
+    if response.status_code in (403, 429) and response.headers.get("X-RateLimit-Remaining") == "0":
+        reset = response.headers.get("X-RateLimit-Reset")
+        reset_str = datetime.fromtimestamp(int(reset)).strftime("%H:%M:%S") if reset else "later"
+        raise Exception(f"GitHub rate limit exceeded, try again after {reset_str}")
+
+def _issues_from_page(items) -> List[Tuple[int, str, str]]:
+    # The issues endpoint returns pull requests too; they carry a "pull_request" key
+    return [(item["number"], item["title"], item.get("body") or "") for item in items if "pull_request" not in item]
+
+def _page_size(entry: Dict) -> int:
+    # Entries cached before "size" was recorded only know their issue count
+    return entry.get("size", len(entry["issues"]))
 
 def fetch_open_issues(repo_name: str, label: str = None) -> List[Tuple[int, str, str]]:
     """
     Fetches open issues from the specified repository.
     Returns a list of tuples: (issue_number, title, body).
+    The first page tells us how many pages there are; the rest are fetched in parallel.
+    Every page is a conditional GET against its cached ETag.
     """
-    g = get_github_client()
-    if not g:
+    session = _get_session()
+    if not session:
         raise ValueError("GITHUB_TOKEN not found in environment variables.")
         
-    try:
-        repo = g.get_repo(repo_name)
+    url = f"{GITHUB_API_URL}/repos/{repo_name}/issues"
+    params = {"state": "open", "per_page": ISSUES_PER_PAGE}
+    if label:
+        params["labels"] = label
+        
+    cache_file = _cache_path(repo_name, label)
+    cache = _load_cache(cache_file)
+    cached_pages = cache.get("pages", {})
+    fresh_pages = {}
+        
+    def fetch_page(page: int) -> List[Tuple[int, str, str]]:
+        cached = cached_pages.get(str(page))
+        headers = {"If-None-Match": cached["etag"]} if cached and cached.get("etag") else {}
+        # Runs on the page workers too, so each thread uses its own session
+        response = _get_session().get(url, params={**params, "page": page}, headers=headers)
         
-        # Filter by label if provided, otherwise get all open issues
-        if label:
-            # Note: PyGithub expects labels as a list of objects or strings, 
-            # but getting the label object first is safer if strict.
-            # For simplicity, we can just filter manually or pass the string if supported.
-            # get_issues(state='open', labels=[...])
-            issues = repo.get_issues(state='open', labels=[label])
+        if response.status_code == 304:
+            fresh_pages[str(page)] = cached
+            issues = [tuple(issue) for issue in cached["issues"]]
         else:
-            issues = repo.get_issues(state='open')
-            
-        results = []
-        for issue in issues:
-            # Skip pull requests (PyGithub treats PRs as issues too)
-            if issue.pull_request:
-                continue
-            results.append((issue.number, issue.title, issue.body or ""))
-            
+            _check_rate_limit(response)
+            response.raise_for_status()
+            items = response.json()
+            issues = _issues_from_page(items)
+            # size counts pull requests too, so a short page can be told from a filtered one
+            fresh_pages[str(page)] = {"etag": response.headers.get("ETag"), "issues": issues, "size": len(items)}
+        
+        if page == 1:
+            # Read on 304s too: issues closed or reopened further back change the
+            # page count without touching page 1
+            last_url = response.links.get("last", {}).get("url")
+            if last_url:
+                cache["last_page"] = int(parse_qs(urlparse(last_url).query)["page"][0])
+            elif response.status_code == 304 and "Link" not in response.headers:
+                cache["last_page"] = None # Unknown, found by walking the pages below
+            else:
+                cache["last_page"] = 1
+        return issues
+        
+    try:
+        # A copy: a fresh page 1 is also the list stored in its cache entry
+        results = list(fetch_page(1))
+        
+        last_page = cache.get("last_page", 1)
+        if last_page is None:
+            # Without a page count, fetch one page at a time until one comes back short
+            last_page = 1
+            while _page_size(fresh_pages[str(last_page)]) >= ISSUES_PER_PAGE:
+                last_page += 1
+                results.extend(fetch_page(last_page))
+            cache["last_page"] = last_page
+        elif last_page > 1:
+            with ThreadPoolExecutor(max_workers=MAX_PAGE_WORKERS) as executor:
+                # map preserves page order
+                for issues in executor.map(fetch_page, range(2, last_page + 1)):
+                    results.extend(issues)
+                    
+        # Drop pages that no longer exist
+        cache["pages"] = fresh_pages
+        _save_cache(cache_file, cache)
         return results
         
     except Exception as e:
@@ -50,28 +150,45 @@ def close_issue(repo_name: str, issue_number: int):
     """
     Closes the specified issue.
     """
-    g = get_github_client()
-    if not g:
+    session = _get_session()
+    if not session:
         raise ValueError("GITHUB_TOKEN not found.")
         
     try:
-        repo = g.get_repo(repo_name)
-        issue = repo.get_issue(issue_number)
-        issue.edit(state='closed')
+        response = session.patch(f"{GITHUB_API_URL}/repos/{repo_name}/issues/{issue_number}", json={"state": "closed"})
+        _check_rate_limit(response)
+        response.raise_for_status()
     except Exception as e:
         raise Exception(f"Failed to close issue #{issue_number}: {e}")
 
+def close_issues(repo_name: str, issue_numbers: List[int]) -> List[Tuple[int, Exception]]:
+    """
+    Closes several issues concurrently.
+    Returns (issue_number, error) pairs in the given order; error is None on success.
+    """
+    def close_one(issue_number: int) -> Tuple[int, Exception]:
+        try:
+            close_issue(repo_name, issue_number)
+            return issue_number, None
+        except Exception as e:
+            return issue_number, e
+
+    with ThreadPoolExecutor(max_workers=MAX_PAGE_WORKERS) as executor:
+        return list(executor.map(close_one, issue_numbers))
+
 def get_repo_privacy(repo_name: str) -> bool:
     """
     Returns True if the repository is private, False otherwise.
     """
-    g = get_github_client()
-    if not g:
+    session = _get_session()
+    if not session:
         raise ValueError("GITHUB_TOKEN not found.")
     
     try:
-        repo = g.get_repo(repo_name)
-        return repo.private
+        response = session.get(f"{GITHUB_API_URL}/repos/{repo_name}")
+        _check_rate_limit(response)
+        response.raise_for_status()
+        return response.json()["private"]
     except Exception as e:
         raise Exception(f"Failed to get repo info for {repo_name}: {e}")
 
@@ -79,20 +196,27 @@ def update_file(repo_name: str, path: str, content: str, message: str):
     """
     Creates or updates a file in the repository.
     """
-    g = get_github_client()
-    if not g:
+    session = _get_session()
+    if not session:
         raise ValueError("GITHUB_TOKEN not found.")
         
     try:
-        repo = g.get_repo(repo_name)
+        url = f"{GITHUB_API_URL}/repos/{repo_name}/contents/{path}"
+        payload = {
+            "message": message,
+            "content": base64.b64encode(content.encode()).decode(),
+        }
         
-        try:
-            # Try to get existing file to get its sha
-            contents = repo.get_contents(path)
-            repo.update_file(contents.path, message, content, contents.sha)
-        except Exception:
-            # File doesn't exist, create it
-            repo.create_file(path, message, content)
+        # Existing files need their sha to be updated; a 404 means we create it
+        existing = session.get(url)
+        _check_rate_limit(existing)
+        if existing.status_code != 404:
+            existing.raise_for_status()
+            payload["sha"] = existing.json()["sha"]
+            
+        response = session.put(url, json=payload)
+        _check_rate_limit(response)
+        response.raise_for_status()
             
     except Exception as e:
         raise Exception(f"Failed to update file {path} in {repo_name}: {e}")
@@ -12,77 +12,207 @@ warnings.filterwarnings("ignore", category=UserWarning, module="urllib3")
 
 import typer
 import time
-from rich.console import Console
-from rich.table import Table
-from typing import Optional, Annotated
+import bisect
+import contextlib
+import functools
+import heapq
+from collections import defaultdict
+from typing import Iterator, Optional, Annotated
 from datetime import datetime, timedelta
-import gemini_client
 import storage
-import timer
-import github_client
 import os
-from models import TaskStatus, Task
-from rich.panel import Panel
-from rich.prompt import Prompt
+from models import TaskStatus, Task, Project
+# gemini_client, github_client and timer pull in heavy dependencies
+# (google.generativeai, requests, rich.live), and rich's Table/Panel/Prompt
+# are only needed by some commands, so they are imported inside the
+# functions that use them.
 import sys
 
 app = typer.Typer()
-console = Console()
+
+class _LazyConsole:
+    """
+    Stands in for the rich Console and only builds it (which probes the
+    terminal) the first time a command actually prints something.
+    """
+    _console = None
+
+    def __getattr__(self, name):
+        if _LazyConsole._console is None:
+            from rich.console import Console
+            _LazyConsole._console = Console()
+        return getattr(_LazyConsole._console, name)
+
+console = _LazyConsole()
 
 def parse_task_refs(task_ref_str: str, tasks: list[Task]) -> list[str]:
     """
     Parses a string of task references (IDs or Indexes) into a list of Task IDs.
     Supports comma-separated values (1,2,3) and ranges (1-3).
     """
-    target_ids = []
+    _ensure_index_map()
+    
+    if ',' not in task_ref_str and '-' not in task_ref_str:
+        # Single Index or ID prefix, the common case: no splitting, sorting or dedupe
+        ref = task_ref_str.strip()
+        if not ref:
+            return []
+        matches = _match_single_ref(ref, tasks)
+        if len(matches) == 1:
+            return matches
+        _warn_unresolved_ref(ref, ambiguous=bool(matches))
+        return []
+        
+    target_ids = {} # Insertion-ordered set: dedupes as it goes, keeps the given order
     refs = [r.strip() for r in task_ref_str.split(',') if r.strip()]
+    sorted_ids = None # Built on the first ID-prefix ref
     
     for ref in refs:
-        if '-' in ref and ref.replace('-', '').isdigit():
+        head, sep, tail = ref.partition('-')
+        if sep and head.isdigit() and tail.isdigit():
             # Range
-            start, end = map(int, ref.split('-'))
+            start, end = int(head), int(tail)
             for i in range(start, end + 1):
-                s_i = str(i)
-                if s_i in TASK_INDEX_MAP:
-                    target_ids.append(TASK_INDEX_MAP[s_i])
-        elif ref.isdigit() and ref in TASK_INDEX_MAP:
+                if i in TASK_INDEX_MAP:
+                    target_ids[TASK_INDEX_MAP[i]] = None
+        elif ref.isdigit() and int(ref) in TASK_INDEX_MAP:
             # Index
-            target_ids.append(TASK_INDEX_MAP[ref])
+            target_ids[TASK_INDEX_MAP[int(ref)]] = None
         else:
             # ID prefix
-            found = False
-            for t in tasks:
-                if t.id.startswith(ref):
-                    target_ids.append(t.id)
-                    found = True
-                    break
-            if not found:
-                console.print(f"[yellow]Warning: Task reference '{ref}' not found.[/yellow]")
+            if sorted_ids is None:
+                sorted_ids = sorted(t.id for t in tasks)
+            matches = find_task_ids_by_prefix(ref, sorted_ids)
+            # bisect puts an exact ID first, and like a single ref it wins over longer IDs
+            if len(matches) == 1 or (matches and matches[0] == ref):
+                target_ids[matches[0]] = None
+            else:
+                _warn_unresolved_ref(ref, ambiguous=bool(matches))
                 
-    return list(set(target_ids)) # Unique IDs
+    return list(target_ids)
+
+def _warn_unresolved_ref(ref: str, ambiguous: bool):
+    if ambiguous:
+        console.print(f"[yellow]Warning: Task reference '{ref}' is ambiguous, use a longer prefix.[/yellow]")
+    else:
+        console.print(f"[yellow]Warning: Task reference '{ref}' not found.[/yellow]")
+
+# Display lookups shared by the list/sync renderers
+STATUS_STYLES = {TaskStatus.DONE: "green"} # Everything else renders yellow
+STATUS_CELL_STYLES = {s: STATUS_STYLES.get(s, "yellow") for s in TaskStatus}
+PRIORITY_ICONS = {"High": "🔴", "Medium": "🟡", "Low": "🔵"}
+PRIORITY_ORDER = {"High": 1, "Medium": 2, "Low": 3}
+
+# Statuses that still count towards "overdue" / "due soon"
+_ACTIVE_STATUSES = frozenset((TaskStatus.TODO, TaskStatus.IN_PROGRESS))
 
-# Global map to store index -> task_id for the current session
+def _deadline_style(days_left: int) -> str:
+    # Overdue or due today, due within a week, later
+    if days_left <= 0:
+        return "bold red"
+    if days_left <= 7:
+        return "yellow"
+    return "green"
+
+@functools.lru_cache(maxsize=256)
+def _tomato_cell(completed: int, estimated: int) -> str:
+    # Tomato counts are small, so the same few "comp/est" strings repeat a lot
+    return f"{completed}/{estimated}"
+
+# Global map to store index (int) -> task_id for the current session.
+# 'list' also saves it to disk so a later 'start 3' in a new process still works.
 TASK_INDEX_MAP = {}
 
+def _ensure_index_map():
+    if not TASK_INDEX_MAP:
+        TASK_INDEX_MAP.update(storage.load_index_map())
+
+def find_task_ids_by_prefix(prefix: str, sorted_ids: list[str]) -> list[str]:
+    """
+    Finds the Task IDs starting with prefix, using a sorted list of all IDs.
+    All IDs sharing a prefix sit next to each other, so bisect finds them
+    in O(log N). At most two are returned: enough to tell unique from ambiguous.
+    """
+    pos = bisect.bisect_left(sorted_ids, prefix)
+    return [t_id for t_id in sorted_ids[pos:pos + 2] if t_id.startswith(prefix)]
+
+def _match_single_ref(ref: str, tasks: list[Task]) -> list[str]:
+    """
+    Matches one list Index, full ID, or ID prefix against the tasks.
+    Returns no IDs, the one match, or several when the prefix is ambiguous.
+    A single ref needs one linear scan; sorting the IDs would cost more.
+    """
+    _ensure_index_map()
+    if ref.isdigit() and int(ref) in TASK_INDEX_MAP:
+        return [TASK_INDEX_MAP[int(ref)]]
+    matches = [t.id for t in tasks if t.id.startswith(ref)]
+    if len(matches) > 1 and ref in matches:
+        # A full ID wins over longer IDs it happens to prefix
+        return [ref]
+    return matches
+
+def _resolve_task(task_ref: str, tasks: list[Task]) -> Optional[Task]:
+    """
+    Resolves a single task reference: list Index, full ID, or ID prefix.
+    Warns and returns None when it is ambiguous or matches nothing.
+    """
+    matches = _match_single_ref(task_ref.strip(), tasks)
+    # An Index can point at a task that has since been deleted
+    task = next((t for t in tasks if t.id == matches[0]), None) if len(matches) == 1 else None
+    if task is None:
+        _warn_unresolved_ref(task_ref, ambiguous=len(matches) > 1)
+    return task
+
 @app.command()
-def ingest(text: str):
+def ingest(
+    text: Annotated[Optional[str], typer.Argument(help="Brain dump text")] = None,
+    file: Annotated[Optional[str], typer.Option(help="Path to a file of brain dumps separated by blank lines")] = None
+):
     """
     Ingest a brain dump of tasks.
+    With --file, every dump in the file is sent to Gemini concurrently.
+    Without text or --file, the brain dump is read from stdin (cat dump.txt | main.py ingest).
     """
-    ingest_logic(text)
+    if file:
+        ingest_file_logic(file)
+    elif text:
+        ingest_logic(text)
+    elif not sys.stdin.isatty():
+        text = sys.stdin.read().strip()
+        if not text:
+            console.print("[bold red]No brain dump received on stdin.[/bold red]")
+            return
+        # The review loop is interactive, so read its answers from the terminal
+        try:
+            tty = open("CON" if os.name == "nt" else "/dev/tty")
+        except OSError:
+            console.print("[bold red]No terminal available for reviewing the ingested tasks; pass the brain dump as an argument or with --file instead.[/bold red]")
+            raise typer.Exit(1)
+        with tty:
+            piped_stdin, sys.stdin = sys.stdin, tty
+            try:
+                ingest_logic(text)
+            finally:
+                sys.stdin = piped_stdin
+    else:
+        console.print("[bold red]Provide a brain dump, --file, or pipe one in on stdin.[/bold red]")
 
-from typing import Optional, Annotated
 
-def filter_tasks(tasks: list[Task], projects: list, project_filter: Optional[str] = None, due_filter: Optional[int] = None, id_filter: Optional[str] = None) -> list[Task]:
+def iter_filtered_tasks(tasks: list[Task], project_map: dict, project_filter: Optional[str] = None, due_filter: Optional[int] = None, id_filter: Optional[str] = None, include_archived: bool = False) -> Iterator[Task]:
     """
-    Helper to filter tasks based on criteria.
+    Yields the tasks matching the criteria, for callers that only iterate once.
+    project_map maps project id -> name. Archived tasks are skipped unless include_archived is set.
     """
-    filtered = []
-    project_map = {p.id: p.name for p in projects}
+    ARCHIVED = TaskStatus.ARCHIVED
     today = datetime.now()
     
+    # Lower-case the filter and each project name once, not once per task
+    if project_filter:
+        project_filter = project_filter.lower()
+        name_lower_by_pid = {pid: name.lower() for pid, name in project_map.items()}
+    
     for t in tasks:
-        if t.status == TaskStatus.ARCHIVED:
+        if not include_archived and t.status is ARCHIVED:
             continue
             
         # ID Filter
@@ -90,23 +220,33 @@ def filter_tasks(tasks: list[Task], projects: list, project_filter: Optional[str
             continue
             
         # Project Filter
-        p_name = project_map.get(t.project_id, "No Project")
-        if project_filter and project_filter.lower() not in p_name.lower():
+        if project_filter and project_filter not in name_lower_by_pid.get(t.project_id, "no project"):
             continue
             
         # Due Filter
         if due_filter is not None:
-            if not t.deadline:
-                continue
-            try:
-                d = datetime.fromisoformat(t.deadline)
-                if (d - today).days > due_filter:
-                    continue
-            except ValueError:
+            d = t.parsed_deadline
+            if d is None or (d - today).days > due_filter:
                 continue
                 
-        filtered.append(t)
-    return filtered
+        yield t
+
+def filter_tasks(tasks: list[Task], projects: list, project_filter: Optional[str] = None, due_filter: Optional[int] = None, id_filter: Optional[str] = None, project_map: Optional[dict] = None, include_archived: bool = False) -> list[Task]:
+    """
+    Helper to filter tasks based on criteria.
+    Pass project_map (id -> name) if the caller already built one.
+    Archived tasks are left out unless include_archived is set.
+    """
+    if not project_filter and due_filter is None and not id_filter:
+        # Only the archived check applies
+        if include_archived:
+            return list(tasks)
+        ARCHIVED = TaskStatus.ARCHIVED
+        return [t for t in tasks if t.status is not ARCHIVED]
+        
+    if project_map is None:
+        project_map = {p.id: p.name for p in projects}
+    return list(iter_filtered_tasks(tasks, project_map, project_filter, due_filter, id_filter, include_archived))
 
 def prompt_filter_options() -> Optional[dict]:
     """
@@ -114,22 +254,22 @@ def prompt_filter_options() -> Optional[dict]:
     Returns a dict of kwargs for filter_tasks/commands, or None if cancelled.
     """
     console.print("[dim]Filter options: [bold cyan]p[/bold cyan]roject, [bold cyan]d[/bold cyan]ue, [bold cyan]i[/bold cyan]d, [bold red]exit[/bold red], or [bold white]Enter[/bold white] for all[/dim]")
-    filter_choice = Prompt.ask("Filter?", default="").strip().lower()
+    filter_choice = _ask("Filter?").strip().lower()
     
     if filter_choice == "exit":
         return None
     
     filters = {}
     if filter_choice == 'p':
-        filters['project'] = Prompt.ask("Project Name")
+        filters['project'] = _ask("Project Name")
     elif filter_choice == 'd':
-        d_val = Prompt.ask("Due within X days")
+        d_val = _ask("Due within X days")
         if d_val.isdigit():
             filters['due'] = int(d_val)
         else:
             console.print("[red]Invalid number, ignoring due filter.[/red]")
     elif filter_choice == 'i':
-        filters['id'] = Prompt.ask("ID Prefix")
+        filters['id'] = _ask("ID Prefix")
         
     return filters
 
@@ -137,38 +277,54 @@ def prompt_filter_options() -> Optional[dict]:
 def list_tasks(
     project: Annotated[Optional[str], typer.Option(help="Filter by project name (fuzzy match)")] = None,
     due: Annotated[Optional[int], typer.Option(help="Filter by tasks due within X days")] = None,
-    id: Annotated[Optional[str], typer.Option(help="Filter by ID prefix")] = None
+    id: Annotated[Optional[str], typer.Option(help="Filter by ID prefix")] = None,
+    limit: Annotated[Optional[int], typer.Option(min=1, help="Show at most N tasks")] = None,
+    offset: Annotated[int, typer.Option(min=0, help="Skip the first N tasks")] = 0
 ):
     """
     List all pending tasks.
     Default sort: Project -> Deadline -> ID.
+    Use --limit/--offset to page through long lists.
     """
-    global TASK_INDEX_MAP
-    TASK_INDEX_MAP.clear()
+    from rich.table import Table
+    from rich.text import Text
     
     tasks, projects = storage.load_data()
     project_map = {p.id: p.name for p in projects}
-    today = datetime.now()
+    today_date = datetime.now().date()
     
     # Filter
-    filtered_tasks = filter_tasks(tasks, projects, project, due, id)
+    filtered_tasks = filter_tasks(tasks, projects, project, due, id, project_map=project_map)
         
     if not filtered_tasks:
+        TASK_INDEX_MAP.clear()
+        storage.save_index_map(TASK_INDEX_MAP) # Don't leave stale indexes behind
         console.print("[yellow]No tasks found matching criteria.[/yellow]")
         return
 
     # Sort: Project Name -> Priority (High>Med>Low) -> Deadline (Empty last) -> ID
-    def sort_key(t):
-        p_name = project_map.get(t.project_id, "No Project")
-        
-        # Priority Value (High=1, Medium=2, Low=3, None=4)
-        priority_map = {"High": 1, "Medium": 2, "Low": 3}
-        p_val = priority_map.get(t.priority, 4)
-        
-        deadline_val = t.deadline if t.deadline else "9999-12-31"
-        return (p_name, p_val, deadline_val, t.id)
-        
-    filtered_tasks.sort(key=sort_key)
+    # Decorated sort: the project name is looked up once per task and reused
+    # for rendering; IDs are unique, so the comparison never reaches the task.
+    decorated = [
+        (
+            project_map.get(t.project_id, "No Project"),
+            PRIORITY_ORDER.get(t.priority, 4), # High=1, Medium=2, Low=3, None=4
+            t.deadline or "9999-12-31",
+            t.id,
+            t
+        )
+        for t in filtered_tasks
+    ]
+    decorated.sort()
+    
+    # Only the visible page is formatted and rendered; Indexes stay global
+    total_count = len(decorated)
+    end = total_count if limit is None else offset + limit
+    page = decorated[offset:end]
+    if not page:
+        # Past the last match: keep the previous listing's Indexes usable
+        console.print(f"[yellow]No tasks at offset {offset}; only {total_count} match. Use a smaller --offset.[/yellow]")
+        return
     
     title = "Pending Tasks"
     if project: title += f" | Project: {project}"
@@ -185,60 +341,48 @@ def list_tasks(
     table.add_column("Project", style="green")
     table.add_column("Deadline", style="red")
     
-    current_index = 1
-    for t in filtered_tasks:
-        p_name = project_map.get(t.project_id, "No Project")
-        status_color = "green" if t.status == TaskStatus.DONE else "yellow"
-        
-        TASK_INDEX_MAP[str(current_index)] = t.id
+    rows = []
+    new_index_map = {}
+    for current_index, (p_name, _, _, _, t) in enumerate(page, offset + 1):
+        new_index_map[current_index] = t.id
         
         deadline_str = t.deadline or ""
         deadline_style = ""
-        if t.deadline:
-            try:
-                due_date = datetime.fromisoformat(t.deadline)
-                delta = (due_date - today).days
-                
-                if delta < 0: # Overdue
-                    deadline_style = "bold red"
-                elif delta <= 0: # Due today (delta is -1 to 0 roughly depending on time)
-                     if due_date.date() < today.date():
-                         deadline_style = "bold red" # Overdue
-                     elif due_date.date() == today.date():
-                         deadline_style = "bold red" # Due Today
-                     elif delta <= 7:
-                         deadline_style = "yellow"
-                     else:
-                         deadline_style = "green"
-                elif delta <= 7:
-                    deadline_style = "yellow"
-                else:
-                    deadline_style = "green"
-            except ValueError:
-                pass
-
-        # Priority Icon
-        p_icon = ""
-        if t.priority == "High":
-            p_icon = "🔴"
-        elif t.priority == "Medium":
-            p_icon = "🟡"
-        elif t.priority == "Low":
-            p_icon = "🔵"
+        d = t.parsed_deadline
+        if d is not None:
+            deadline_style = _deadline_style((d.date() - today_date).days)
 
-        table.add_row(
-            str(current_index),
-            t.id[:8],
-            p_icon,
-            t.title, 
-            f"{t.completed_tomatoes}/{t.estimated_tomatoes}", 
-            f"[{status_color}]{t.status.value}[/{status_color}]", 
-            p_name,
-            f"[{deadline_style}]{deadline_str}[/{deadline_style}]" if deadline_style else deadline_str
-        )
-        current_index += 1
+        # Text cells are rendered as-is, without a markup parse per cell
+        # (which also keeps '[...]' in titles from being read as markup)
+        rows.append((
+            Text(str(current_index)),
+            Text(t.short_id),
+            Text(PRIORITY_ICONS.get(t.priority, "")),
+            Text(t.title), 
+            Text(_tomato_cell(t.completed_tomatoes, t.estimated_tomatoes)), 
+            Text(t.status.value, style=STATUS_CELL_STYLES[t.status]), 
+            Text(p_name),
+            Text(deadline_str, style=deadline_style)
+        ))
+        
+    add_row = table.add_row
+    for row in rows:
+        add_row(*row)
+    
+    # Swap the index map in one step once the page is built
+    TASK_INDEX_MAP.clear()
+    TASK_INDEX_MAP.update(new_index_map)
+    storage.save_index_map(TASK_INDEX_MAP)
             
-    console.print(table)
+    # Styles are set on the cells; skip Rich's regex-based auto highlighting
+    console.print(table, highlight=False)
+    if len(page) < total_count:
+        console.print(f"[dim]Showing {offset + 1}-{offset + len(page)} of {total_count} tasks. Use --offset/--limit to see more.[/dim]")
+
+def _recover_interrupted_pomodoro():
+    task_id = storage.recover_active_task()
+    if task_id:
+        console.print(f"[yellow]Previous Pomodoro for task {task_id[:8]} was interrupted; it is now marked in_progress.[/yellow]")
 
 @app.command()
 def start(task_ref: str):
@@ -246,35 +390,21 @@ def start(task_ref: str):
     Start a Pomodoro timer for a specific task.
     Accepts Task ID (prefix) OR Task Index (if list was run previously).
     """
-    tasks, projects = storage.load_data()
+    import timer
     
-    target_task_id = None
-    
-    # Check if input is an index
-    if task_ref.isdigit() and task_ref in TASK_INDEX_MAP:
-        target_task_id = TASK_INDEX_MAP[task_ref]
-    else:
-        # Assume it's an ID prefix
-        for t in tasks:
-            if t.id.startswith(task_ref):
-                target_task_id = t.id
-                break
+    _recover_interrupted_pomodoro()
+    tasks, projects = storage.load_data()
     
-    if not target_task_id:
-        console.print(f"[bold red]Task '{task_ref}' not found. Try running 'list' first.[/bold red]")
-        return
-        
-    target_task = next((t for t in tasks if t.id == target_task_id), None)
-            
+    target_task = _resolve_task(task_ref, tasks)
     if not target_task:
-        console.print(f"[bold red]Task with ID '{target_task_id}' not found.[/bold red]")
-        return
+        return # _resolve_task has said why
 
     console.print(f"[bold]Starting Pomodoro for:[/bold] {target_task.title}")
     
-    # Update status to in_progress
+    # Update status to in_progress. Only the sidecar is written now; if we never
+    # reach the final save, the next start/interactive recovers the status from it.
     target_task.status = TaskStatus.IN_PROGRESS
-    storage.save_data(tasks, projects)
+    storage.set_active_task(target_task.id)
     
     try:
         timer.run_timer(minutes=25, task_title=target_task.title)
@@ -296,71 +426,39 @@ def start(task_ref: str):
         console.print("[yellow]Task status remains 'in_progress'.[/yellow]")
         
     storage.save_data(tasks, projects)
+    storage.clear_active_task()
 
 @app.command()
 def stats(
     project: Annotated[Optional[str], typer.Option(help="Filter by project name")] = None,
     due: Annotated[Optional[int], typer.Option(help="Filter by tasks due within X days")] = None,
-    id: Annotated[Optional[str], typer.Option(help="Filter by ID prefix")] = None
+    id: Annotated[Optional[str], typer.Option(help="Filter by ID prefix")] = None,
+    top: Annotated[Optional[int], typer.Option(min=1, help="Only show the N projects with the most estimated tomatoes")] = None
 ):
     """
     Show progress statistics.
     """
-    tasks, projects = storage.load_data()
-    
-    # Filter tasks first
-    # Note: filter_tasks excludes archived, but for stats we might want to see completed ones too?
-    # The original stats logic iterated over ALL tasks (including archived? No, load_data returns all).
-    # Original logic:
-    # for t in tasks:
-    #    total_estimated += t.estimated_tomatoes
-    #    total_completed += t.completed_tomatoes
-    
-    # If we use filter_tasks, it excludes ARCHIVED.
-    # Let's use filter_tasks but maybe we want to include done/archived for stats?
-    # Usually stats are for "active" or "all time"?
-    # The original code: "for t in tasks:" -> implies all tasks loaded.
-    # But wait, filter_tasks has "if t.status == TaskStatus.ARCHIVED: continue".
-    # If I want to filter by project, I should probably filter ALL tasks.
+    from rich.panel import Panel
+    from rich.table import Table
     
-    # Let's make a custom filter loop here or modify filter_tasks to accept a status list?
-    # For simplicity, let's just filter manually here reusing logic or just copy-paste for now to be safe about ARCHIVED.
-    # Actually, if I filter by project "Work", I want to see stats for "Work".
+    tasks, projects = storage.load_data()
     
-    filtered_tasks = []
+    # Stats cover everything in tasks.json, including tasks marked archived
     project_map = {p.id: p.name for p in projects}
-    today = datetime.now()
-    
-    for t in tasks:
-        # ID Filter
-        if id and not t.id.startswith(id):
-            continue
-            
-        # Project Filter
-        p_name = project_map.get(t.project_id, "No Project")
-        if project and project.lower() not in p_name.lower():
-            continue
-            
-        # Due Filter
-        if due is not None:
-            if not t.deadline:
-                continue
-            try:
-                d = datetime.fromisoformat(t.deadline)
-                if (d - today).days > due:
-                    continue
-            except ValueError:
-                continue
-                
-        filtered_tasks.append(t)
     
+    # Filter, totals and per-project breakdown in a single pass
     total_estimated = 0
     total_completed = 0
+    project_agg = defaultdict(lambda: [0, 0]) # project_id -> [est, comp]
     
-    # Calculate stats for filtered tasks
-    for t in filtered_tasks:
-        total_estimated += t.estimated_tomatoes
-        total_completed += t.completed_tomatoes
+    for t in iter_filtered_tasks(tasks, project_map, project, due, id, include_archived=True):
+        est = t.estimated_tomatoes
+        comp = t.completed_tomatoes
+        agg = project_agg[t.project_id]
+        agg[0] += est
+        agg[1] += comp
+        total_estimated += est
+        total_completed += comp
         
     if total_estimated == 0 and total_completed == 0:
         console.print("[yellow]No tasks found matching criteria.[/yellow]")
@@ -379,26 +477,29 @@ def stats(
     Progress: [magenta]{percentage:.1f}%[/magenta]
     """, title=title_text, border_style="blue"))
     
-    # Breakdown by Project
-    project_stats = {}
+    # Breakdown by Project (several IDs can share a name, e.g. "No Project")
+    project_stats = defaultdict(lambda: [0, 0]) # name -> [est, comp]
     
-    for t in filtered_tasks:
-        p_name = project_map.get(t.project_id, "No Project")
-        if p_name not in project_stats:
-            project_stats[p_name] = {"est": 0, "comp": 0}
-        project_stats[p_name]["est"] += t.estimated_tomatoes
-        project_stats[p_name]["comp"] += t.completed_tomatoes
+    for p_id, (est, comp) in project_agg.items():
+        agg = project_stats[project_map.get(p_id, "No Project")]
+        agg[0] += est
+        agg[1] += comp
         
     table = Table(title="Project Breakdown")
     table.add_column("Project", style="cyan")
     table.add_column("Progress", style="magenta")
     table.add_column("Percentage", style="green")
     
-    for p_name, stats in project_stats.items():
-        pct = (stats["comp"] / stats["est"]) * 100 if stats["est"] > 0 else 0
-        table.add_row(p_name, f"{stats['comp']}/{stats['est']}", f"{pct:.1f}%")
+    project_rows = project_stats.items()
+    if top is not None:
+        project_rows = heapq.nlargest(top, project_rows, key=lambda item: item[1][0])
+    
+    add_row = table.add_row
+    for p_name, (est, comp) in project_rows:
+        pct = (comp / est) * 100 if est > 0 else 0
+        add_row(p_name, f"{comp}/{est}", f"{pct:.1f}%")
         
-    console.print(table)
+    console.print(table, highlight=False)
 
 @app.command()
 def archive(days: int = 0):
@@ -412,24 +513,21 @@ def archive(days: int = 0):
     tasks_to_keep = []
     tasks_to_archive = []
     
-    cutoff_date = datetime.now() - timedelta(days=days)
+    # completed_at is always written by datetime.now().isoformat(), and
+    # ISO-8601 strings in one format sort chronologically, so compare as text
+    cutoff_iso = (datetime.now() - timedelta(days=days)).isoformat()
+    DONE, ARCHIVED = TaskStatus.DONE, TaskStatus.ARCHIVED
     
     for t in tasks:
         should_archive = False
-        if t.status == TaskStatus.DONE:
+        if t.status is DONE:
             if days == 0:
                 should_archive = True
-            elif t.completed_at:
-                # Parse completed_at
-                try:
-                    comp_date = datetime.fromisoformat(t.completed_at)
-                    if comp_date < cutoff_date:
-                        should_archive = True
-                except ValueError:
-                    pass # Keep if date is invalid
+            elif t.completed_at and t.completed_at < cutoff_iso:
+                should_archive = True
                     
         if should_archive:
-            t.status = TaskStatus.ARCHIVED
+            t.status = ARCHIVED
             tasks_to_archive.append(t)
         else:
             tasks_to_keep.append(t)
@@ -438,13 +536,9 @@ def archive(days: int = 0):
         console.print("[yellow]No tasks to archive.[/yellow]")
         return
         
-    # Save active tasks
-    storage.save_data(tasks_to_keep, projects)
+    # Append to archive and save active tasks in one go
+    storage.save_data_and_archive(tasks_to_keep, projects, tasks_to_archive)
     
-    # Append to archive
-    storage.append_to_archive(tasks_to_archive)
-    
-    console.print(f"[bold green]Archived {len(tasks_to_archive)} tasks.[/bold green]")
     console.print(f"[bold green]Archived {len(tasks_to_archive)} tasks.[/bold green]")
 
 @app.command()
@@ -461,11 +555,8 @@ def delete(task_refs: str):
         console.print("[bold red]No valid tasks found.[/bold red]")
         return
         
-    tasks_to_delete = []
-    for t_id in target_ids:
-        t = next((t for t in tasks if t.id == t_id), None)
-        if t:
-            tasks_to_delete.append(t)
+    by_id = {t.id: t for t in tasks}
+    tasks_to_delete = [by_id[t_id] for t_id in target_ids if t_id in by_id]
             
     if not tasks_to_delete:
         console.print("[bold red]No tasks found to delete.[/bold red]")
@@ -481,7 +572,8 @@ def delete(task_refs: str):
         return
 
     # Filter out
-    new_tasks = [t for t in tasks if t.id not in target_ids]
+    target_set = set(target_ids)
+    new_tasks = [t for t in tasks if t.id not in target_set]
         
     storage.save_data(new_tasks, projects)
     console.print(f"[bold green]Deleted {len(tasks_to_delete)} tasks.[/bold green]")
@@ -492,6 +584,9 @@ def edit(task_refs: str):
     Edit task(s) by ID or Index.
     Supports multiple tasks: "1,2,3" or "1-3".
     """
+    from rich.panel import Panel
+    from rich.prompt import Prompt
+    
     tasks, projects = storage.load_data()
     target_ids = parse_task_refs(task_refs, tasks)
     
@@ -499,7 +594,8 @@ def edit(task_refs: str):
         console.print("[bold red]No valid tasks found.[/bold red]")
         return
         
-    target_tasks = [t for t in tasks if t.id in target_ids]
+    by_id = {t.id: t for t in tasks}
+    target_tasks = [by_id[t_id] for t_id in target_ids if t_id in by_id]
     project_map = {p.id: p.name for p in projects}
     
     if len(target_tasks) == 1:
@@ -548,20 +644,9 @@ def edit(task_refs: str):
         # Project
         new_p_name = Prompt.ask("New Project", default=p_name)
         if new_p_name != p_name:
-            # Find or create
-            found_p = next((p for p in projects if p.name == new_p_name), None)
+            found_p = _find_or_create_project(new_p_name, projects, {p.name: p for p in reversed(projects)})
             if found_p:
                 t.project_id = found_p.id
-            else:
-                if typer.confirm(f"Create new project '{new_p_name}'?"):
-                    new_p = gemini_client.Project(
-                        id=f"p_{datetime.now().timestamp()}",
-                        name=new_p_name,
-                        description="",
-                        created_at=datetime.now().isoformat()
-                    )
-                    projects.append(new_p)
-                    t.project_id = new_p.id
                     
         console.print("[bold green]Task updated![/bold green]")
         
@@ -592,26 +677,10 @@ def edit(task_refs: str):
                 
             new_p_name = Prompt.ask("Enter New Project Name")
             
-            # Find or create
-            found_p = next((p for p in projects if p.name == new_p_name), None)
-            target_p_id = None
-            
+            found_p = _find_or_create_project(new_p_name, projects, {p.name: p for p in reversed(projects)})
             if found_p:
-                target_p_id = found_p.id
-            else:
-                if typer.confirm(f"Create new project '{new_p_name}'?"):
-                    new_p = gemini_client.Project(
-                        id=f"p_{datetime.now().timestamp()}",
-                        name=new_p_name,
-                        description="",
-                        created_at=datetime.now().isoformat()
-                    )
-                    projects.append(new_p)
-                    target_p_id = new_p.id
-            
-            if target_p_id:
                 for t in target_tasks:
-                    t.project_id = target_p_id
+                    t.project_id = found_p.id
                 console.print(f"[bold green]Updated project for {len(target_tasks)} tasks.[/bold green]")
                 
         elif choice == "d":
@@ -650,13 +719,29 @@ def edit(task_refs: str):
 
         elif choice == "i":
             for t in target_tasks:
-                console.print(f"Editing: [dim]{t.id[:8]}[/dim]")
-                new_title = Prompt.ask("Title", default=t.title)
+                console.print(f"Editing: [dim]{t.short_id}[/dim]")
+                new_title = _ask("Title", default=t.title)
                 t.title = new_title
             console.print(f"[bold green]Updated titles for {len(target_tasks)} tasks.[/bold green]")
 
     storage.save_data(tasks, projects)
 
+def _find_or_create_project(name: str, projects: list[Project], projects_by_name: dict[str, Project]) -> Optional[Project]:
+    """
+    Looks a project up by name, offering to create it if there is none.
+    A created project is added to both projects and projects_by_name.
+    Returns None if the user declines.
+    """
+    found = projects_by_name.get(name)
+    if found is not None:
+        return found
+    if typer.confirm(f"Create new project '{name}'?"):
+        new_p = Project(name=name)
+        projects.append(new_p)
+        projects_by_name[name] = new_p
+        return new_p
+    return None
+
 @app.command()
 def complete(task_refs: str):
     """
@@ -671,11 +756,14 @@ def complete(task_refs: str):
         console.print("[bold red]No valid tasks found.[/bold red]")
         return
         
+    completed_at = datetime.now().isoformat()
+    by_id = {t.id: t for t in tasks}
     count = 0
-    for t in tasks:
-        if t.id in target_ids:
+    for t_id in target_ids:
+        t = by_id.get(t_id)
+        if t:
             t.status = TaskStatus.DONE
-            t.completed_at = datetime.now().isoformat()
+            t.completed_at = completed_at
             count += 1
     
     storage.save_data(tasks, projects)
@@ -686,6 +774,8 @@ def check_github():
     """
     Check GitHub Inbox for new issues and ingest them.
     """
+    import github_client
+    
     repo_name = os.getenv("GITHUB_REPO")
     if not repo_name:
         console.print("[bold red]GITHUB_REPO not set in .env file.[/bold red]")
@@ -733,12 +823,12 @@ def check_github():
         
         if saved:
             console.print("[bold blue]Closing GitHub issues...[/bold blue]")
-            for number, _, _ in issues:
-                try:
-                    github_client.close_issue(repo_name, number)
+            results = github_client.close_issues(repo_name, [number for number, _, _ in issues])
+            for number, error in results:
+                if error is None:
                     console.print(f" - Closed issue #{number}")
-                except Exception as e:
-                    console.print(f"[red]Failed to close issue #{number}: {e}[/red]")
+                else:
+                    console.print(f"[red]{error}[/red]")
             console.print("[bold green]GitHub sync complete![/bold green]")
         else:
             console.print("[yellow]Ingest discarded. GitHub issues left open.[/yellow]")
@@ -752,6 +842,8 @@ def sync():
     Sync current tasks to GitHub (tasks.md).
     Requires GITHUB_REPO to be a PRIVATE repository.
     """
+    import github_client
+    
     repo_name = os.getenv("GITHUB_REPO")
     if not repo_name:
         console.print("[bold red]GITHUB_REPO not set in .env file.[/bold red]")
@@ -772,72 +864,58 @@ def sync():
         project_map = {p.id: p.name for p in projects}
         
         # 3. Format Markdown
-        md_lines = ["# Current Tasks", "", f"Last Updated: {datetime.now().isoformat()}", ""]
-        
-        # 3a. Due Soon Section
         today = datetime.now()
+        today_date = today.date()
+        md_lines = ["# Current Tasks", "", f"Last Updated: {today.isoformat()}", ""]
+        
+        # 3a. One pass over the tasks collects the Due Soon, High Priority
+        # and per-project sections
+        DONE, IN_PROGRESS, ARCHIVED = TaskStatus.DONE, TaskStatus.IN_PROGRESS, TaskStatus.ARCHIVED
         due_soon_tasks = []
         high_priority_tasks = []
+        tasks_by_project = defaultdict(list)
         
         for t in tasks:
-            if t.status in [TaskStatus.TODO, TaskStatus.IN_PROGRESS]:
-                # Due Soon
-                if t.deadline:
-                    try:
-                        d = datetime.fromisoformat(t.deadline)
-                        if (d - today).days <= 7: # Overdue or within 7 days
-                            due_soon_tasks.append((t, d))
-                    except ValueError:
-                        pass
-                # High Priority
-                if t.priority == "High":
-                    high_priority_tasks.append(t)
+            if t.status is ARCHIVED:
+                continue
+            tasks_by_project[project_map.get(t.project_id, "No Project")].append(t)
+            if t.status is DONE:
+                continue
+            # Due Soon
+            d = t.parsed_deadline
+            if d is not None and (d - today).days <= 7: # Overdue or within 7 days
+                due_soon_tasks.append((t, d))
+            # High Priority
+            if t.priority == "High":
+                high_priority_tasks.append(t)
 
         if due_soon_tasks:
             due_soon_tasks.sort(key=lambda x: x[1])
-            md_lines.append("## 🚨 Due Soon (Next 7 Days)")
-            md_lines.append("| Date | Title | Project |")
-            md_lines.append("| :--- | :--- | :--- |")
+            md_lines.extend(("## 🚨 Due Soon (Next 7 Days)", "| Date | Title | Project |", "| :--- | :--- | :--- |"))
             for t, d in due_soon_tasks:
-                icon = "🔴" if d.date() <= today.date() else "🟡"
+                icon = "🔴" if d.date() <= today_date else "🟡"
                 p_name = project_map.get(t.project_id, "Unknown")
                 md_lines.append(f"| {icon} {t.deadline} | {t.title} | {p_name} |")
             md_lines.append("")
 
         if high_priority_tasks:
-            md_lines.append("## 🔥 High Priority")
-            md_lines.append("| Title | Project | Deadline |")
-            md_lines.append("| :--- | :--- | :--- |")
+            md_lines.extend(("## 🔥 High Priority", "| Title | Project | Deadline |", "| :--- | :--- | :--- |"))
             for t in high_priority_tasks:
                 p_name = project_map.get(t.project_id, "Unknown")
                 md_lines.append(f"| {t.title} | {p_name} | {t.deadline or ''} |")
             md_lines.append("")
 
-        # Group by Project
-        tasks_by_project = {}
-        for t in tasks:
-            if t.status == TaskStatus.ARCHIVED:
-                continue
-            p_name = project_map.get(t.project_id, "No Project")
-            if p_name not in tasks_by_project:
-                tasks_by_project[p_name] = []
-            tasks_by_project[p_name].append(t)
-            
+        # 3b. Group by Project
         for p_name, p_tasks in tasks_by_project.items():
-            md_lines.append(f"## {p_name}")
-            md_lines.append("| ID | P | Status | Title | Tomatoes | Deadline |")
-            md_lines.append("| :--- | :--- | :--- | :--- | :--- | :--- |")
+            md_lines.extend((f"## {p_name}", "| ID | P | Status | Title | Tomatoes | Deadline |", "| :--- | :--- | :--- | :--- | :--- | :--- |"))
             for t in p_tasks:
-                status_icon = "✅" if t.status == TaskStatus.DONE else "⬜"
-                if t.status == TaskStatus.IN_PROGRESS:
+                status_icon = "✅" if t.status is DONE else "⬜"
+                if t.status is IN_PROGRESS:
                     status_icon = "🍅"
                 
-                p_icon = ""
-                if t.priority == "High": p_icon = "🔴"
-                elif t.priority == "Medium": p_icon = "🟡"
-                elif t.priority == "Low": p_icon = "🔵"
+                p_icon = PRIORITY_ICONS.get(t.priority, "")
                 
-                md_lines.append(f"| `{t.id[:8]}` | {p_icon} | {status_icon} | {t.title} | {t.completed_tomatoes}/{t.estimated_tomatoes} | {t.deadline or ''} |")
+                md_lines.append(f"| `{t.short_id}` | {p_icon} | {status_icon} | {t.title} | {t.completed_tomatoes}/{t.estimated_tomatoes} | {t.deadline or ''} |")
             md_lines.append("")
             
         content = "\n".join(md_lines)
@@ -854,28 +932,26 @@ def due(days: int = 7):
     """
     List tasks due within the next X days (default 7).
     """
+    from rich.table import Table
+    from rich.text import Text
+    
     tasks, projects = storage.load_data()
     project_map = {p.id: p.name for p in projects}
     
-    cutoff_date = datetime.now() + timedelta(days=days)
     today = datetime.now()
+    today_date = today.date()
+    cutoff_date = (today + timedelta(days=days)).date()
     
     due_tasks = []
+    DONE, ARCHIVED = TaskStatus.DONE, TaskStatus.ARCHIVED
     
     for t in tasks:
-        if t.status == TaskStatus.ARCHIVED or t.status == TaskStatus.DONE:
-            continue
-        if not t.deadline:
-            continue
-            
-        try:
-            t_date = datetime.fromisoformat(t.deadline)
-            # Check if due date is <= cutoff (and we include overdue tasks too usually?)
-            # Let's include everything up to cutoff.
-            if t_date.date() <= cutoff_date.date():
-                due_tasks.append((t, t_date))
-        except ValueError:
+        if t.status is ARCHIVED or t.status is DONE:
             continue
+        t_date = t.parsed_deadline
+        # Everything up to the cutoff, overdue tasks included
+        if t_date is not None and t_date.date() <= cutoff_date:
+            due_tasks.append((t, t_date))
             
     if not due_tasks:
         console.print(f"[green]No tasks due within the next {days} days![/green]")
@@ -890,71 +966,138 @@ def due(days: int = 7):
     table.add_column("Project", style="green")
     
     for t, date in due_tasks:
-        style = "green"
-        if date.date() < today.date():
-            style = "bold red" # Overdue
-        elif date.date() == today.date():
-            style = "bold red" # Today
-        elif (date - today).days <= 7:
-            style = "yellow"
-            
+        style = _deadline_style((date.date() - today_date).days)
         table.add_row(
-            f"[{style}]{t.deadline}[/{style}]",
-            t.title,
-            project_map.get(t.project_id, "Unknown")
+            Text(t.deadline, style=style),
+            Text(t.title),
+            Text(project_map.get(t.project_id, "Unknown"))
         )
         
-    console.print(table)
+    console.print(table, highlight=False)
 
 def ingest_logic(text: str) -> bool:
     """
     Reusable ingest logic. Returns True if saved, False if discarded.
     """
-    console.print("[bold blue]Processing with Gemini...[/bold blue]")
+    import gemini_client
+    
     try:
-        new_tasks, new_projects = gemini_client.process_brain_dump(text)
+        with console.status("[bold blue]Processing with Gemini...[/bold blue]") as status:
+            new_tasks, new_projects = gemini_client.process_brain_dump(
+                text,
+                on_progress=lambda n: status.update(f"[bold blue]Processing with Gemini... ({n} items received)[/bold blue]")
+            )
+    except Exception as e:
+        console.print(f"[bold red]Error:[/bold red] {e}")
+        return False
+    return review_ingested(new_tasks, new_projects)
+
+def ingest_file_logic(filepath: str) -> bool:
+    """
+    Ingests every brain dump in a file (separated by blank lines) in one batch.
+    Returns True if saved, False if discarded.
+    """
+    import asyncio
+    import gemini_client
+    
+    try:
+        with open(filepath, 'r') as f:
+            content = f.read()
+    except OSError as e:
+        console.print(f"[bold red]Could not read {filepath}:[/bold red] {e}")
+        return False
         
+    texts = [chunk.strip() for chunk in content.split("\n\n") if chunk.strip()]
+    if not texts:
+        console.print("[yellow]No brain dumps found in file.[/yellow]")
+        return False
+        
+    console.print(f"[bold blue]Processing {len(texts)} brain dumps with Gemini...[/bold blue]")
+    try:
+        results = asyncio.run(gemini_client.process_many(texts))
+    except Exception as e:
+        console.print(f"[bold red]Error:[/bold red] {e}")
+        return False
+        
+    new_tasks = []
+    new_projects = []
+    for tasks, projects in results:
+        new_tasks.extend(tasks)
+        new_projects.extend(projects)
+    return review_ingested(new_tasks, new_projects)
+
+def review_ingested(new_tasks: list[Task], new_projects: list) -> bool:
+    """
+    Merges freshly parsed tasks/projects with existing data and runs the review loop.
+    Returns True if saved, False if discarded.
+    """
+    if not new_tasks:
+        # Nothing to review; don't lay out an empty draft table
+        console.print("[yellow]No tasks found in the brain dump.[/yellow]")
+        return False
+        
+    from rich.panel import Panel
+    from rich.prompt import Prompt
+    from rich.table import Table
+    
+    try:
         # Load existing data
         existing_tasks, existing_projects = storage.load_data()
         
         # Initial smart merge of projects
-        existing_project_names = {p.name: p for p in existing_projects}
-        final_projects = existing_projects.copy()
+        projects_by_name = {p.name: p for p in existing_projects}
+        final_projects = existing_projects # load_data hands out a fresh list, no copy needed
         
-        # Map new project IDs to existing ones if name matches
+        # Map new project IDs to existing ones if name matches.
+        # Only IDs that actually change are recorded.
         project_id_map = {} # old_id -> new_id
         
+        # One dict.get per project covers both the presence test and the lookup.
+        # New projects are added to the map so duplicate names within the same
+        # batch (e.g. "General" from several dumps) collapse into one project.
         for p in new_projects:
-            if p.name in existing_project_names:
-                existing_p = existing_project_names[p.name]
+            existing_p = projects_by_name.get(p.name)
+            if existing_p is not None:
                 project_id_map[p.id] = existing_p.id
             else:
                 final_projects.append(p)
-                existing_project_names[p.name] = p
-                project_id_map[p.id] = p.id
+                projects_by_name[p.name] = p
                 
-        # Update tasks with mapped project IDs
-        for t in new_tasks:
-            if t.project_id in project_id_map:
-                t.project_id = project_id_map[t.project_id]
+        # Update tasks with mapped project IDs in one pass
+        if project_id_map:
+            for t in new_tasks:
+                t.project_id = project_id_map.get(t.project_id, t.project_id)
 
+        # Kept up to date as projects are created, instead of rebuilt per iteration
+        project_map = {p.id: p.name for p in final_projects}
+        
+        # Cells are formatted once per draft and re-formatted only for tasks that change
+        def draft_row(i: int, t: Task) -> tuple:
+            return (str(i), project_map.get(t.project_id, "Unknown"), t.title, str(t.estimated_tomatoes), t.deadline or "")
+        draft_rows = [draft_row(i, t) for i, t in enumerate(new_tasks, 1)]
+        
+        # project_id -> indexes into new_tasks, so a merge touches only the tasks it moves
+        draft_idx_by_project = defaultdict(list)
+        for i, t in enumerate(new_tasks):
+            draft_idx_by_project[t.project_id].append(i)
+        
         # Review Loop
+        table = None # Rebuilt only after an edit or merge changed the drafts
         while True:
             console.clear()
             console.print(Panel("[bold blue]Review Ingested Tasks[/bold blue]"))
             
-            table = Table(title="Draft Tasks")
-            table.add_column("Index", style="bold white")
-            table.add_column("Project", style="green")
-            table.add_column("Title", style="cyan")
-            table.add_column("Tomatoes", style="magenta")
-            table.add_column("Deadline", style="red")
-            
-            project_map = {p.id: p.name for p in final_projects}
-            
-            for i, t in enumerate(new_tasks, 1):
-                p_name = project_map.get(t.project_id, "Unknown")
-                table.add_row(str(i), p_name, t.title, str(t.estimated_tomatoes), t.deadline or "")
+            if table is None:
+                table = Table(title="Draft Tasks")
+                table.add_column("Index", style="bold white")
+                table.add_column("Project", style="green")
+                table.add_column("Title", style="cyan")
+                table.add_column("Tomatoes", style="magenta")
+                table.add_column("Deadline", style="red")
+                
+                add_row = table.add_row
+                for row in draft_rows:
+                    add_row(*row)
                 
             console.print(table)
             
@@ -967,8 +1110,8 @@ def ingest_logic(text: str) -> bool:
             choice = Prompt.ask("Action").strip().lower()
             
             if choice == 's':
-                final_tasks = existing_tasks + new_tasks
-                storage.save_data(final_tasks, final_projects)
+                existing_tasks.extend(new_tasks) # load_data's list is ours to grow
+                storage.save_data(existing_tasks, final_projects)
                 console.print(f"[bold green]Successfully added {len(new_tasks)} tasks![/bold green]")
                 return True
                 
@@ -981,6 +1124,7 @@ def ingest_logic(text: str) -> bool:
                     idx = int(choice.split()[1]) - 1
                     if 0 <= idx < len(new_tasks):
                         task = new_tasks[idx]
+                        table = None
                         console.print(f"Editing: [bold]{task.title}[/bold]")
                         
                         new_title = Prompt.ask("Title", default=task.title)
@@ -1016,21 +1160,18 @@ def ingest_logic(text: str) -> bool:
                         current_p_name = project_map.get(task.project_id, "Unknown")
                         new_p_name = Prompt.ask("Project", default=current_p_name)
                         
-                        # Find or create project
-                        found_p = next((p for p in final_projects if p.name == new_p_name), None)
+                        found_p = _find_or_create_project(new_p_name, final_projects, projects_by_name)
                         if found_p:
-                            task.project_id = found_p.id
-                        else:
-                            # Create new project?
-                            if typer.confirm(f"Create new project '{new_p_name}'?"):
-                                new_p = gemini_client.Project(
-                                    id=f"p_{datetime.now().timestamp()}",
-                                    name=new_p_name,
-                                    description="",
-                                    created_at=datetime.now().isoformat()
-                                )
-                                final_projects.append(new_p)
-                                task.project_id = new_p.id
+                            project_map[found_p.id] = found_p.name
+                            if found_p.id != task.project_id:
+                                old_idxs = draft_idx_by_project[task.project_id]
+                                old_idxs.remove(idx)
+                                if not old_idxs:
+                                    del draft_idx_by_project[task.project_id]
+                                draft_idx_by_project[found_p.id].append(idx)
+                                task.project_id = found_p.id
+                            
+                        draft_rows[idx] = draft_row(idx + 1, task)
                     else:
                         console.print("[red]Invalid index[/red]")
                         time.sleep(1)
@@ -1041,7 +1182,7 @@ def ingest_logic(text: str) -> bool:
             elif choice == 'm':
                 # Simple merge workflow
                 # List projects
-                p_list = list({p.name for p in final_projects if any(t.project_id == p.id for t in new_tasks)})
+                p_list = list(dict.fromkeys(p.name for p in final_projects if p.id in draft_idx_by_project))
                 console.print("Active Projects in Draft:")
                 for i, name in enumerate(p_list, 1):
                     console.print(f"{i}. {name}")
@@ -1054,15 +1195,18 @@ def ingest_logic(text: str) -> bool:
                         src_name = p_list[src_idx]
                         dest_name = p_list[dest_idx]
                         
-                        src_p = next(p for p in final_projects if p.name == src_name)
-                        dest_p = next(p for p in final_projects if p.name == dest_name)
+                        src_p = projects_by_name[src_name]
+                        dest_p = projects_by_name[dest_name]
                         
                         # Move tasks
-                        count = 0
-                        for t in new_tasks:
-                            if t.project_id == src_p.id:
-                                t.project_id = dest_p.id
-                                count += 1
+                        moved = draft_idx_by_project.pop(src_p.id, [])
+                        for i in moved:
+                            t = new_tasks[i]
+                            t.project_id = dest_p.id
+                            draft_rows[i] = draft_row(i + 1, t)
+                        draft_idx_by_project[dest_p.id].extend(moved)
+                        count = len(moved)
+                        table = None
                         console.print(f"[green]Moved {count} tasks from '{src_name}' to '{dest_name}'[/green]")
                         time.sleep(1)
                     else:
@@ -1079,50 +1223,123 @@ def ingest_logic(text: str) -> bool:
         console.print(f"[bold red]Error:[/bold red] {e}")
         return False
 
+def _setup_readline():
+    """
+    Enables line editing, history and Tab completion for input().
+    Quietly does nothing where readline isn't available (e.g. Windows).
+    """
+    try:
+        import readline
+    except ImportError:
+        return
+        
+    if "libedit" in (readline.__doc__ or ""):
+        readline.parse_and_bind("bind ^I rl_complete") # macOS
+    else:
+        readline.parse_and_bind("tab: complete")
+
+@contextlib.contextmanager
+def _completing(choices: list[str]):
+    """
+    Tab-completes choices while the block reads input, then puts the previous
+    completer back, so later prompts (brain dumps, task refs) don't complete menu numbers.
+    """
+    try:
+        import readline
+    except ImportError:
+        yield
+        return
+        
+    def complete(text, state):
+        matches = [c for c in choices if c.startswith(text)]
+        return matches[state] if state < len(matches) else None
+        
+    previous = readline.get_completer()
+    readline.set_completer(complete)
+    try:
+        yield
+    finally:
+        readline.set_completer(previous)
+
+def _ask(question: str, default: str = "") -> str:
+    """
+    Plain input() question for prompts that are asked many times in a row,
+    without building a rich Prompt for each one. Empty input returns default.
+    """
+    from rich.markup import escape
+    prompt = f"{question} [cyan]({escape(default)})[/cyan]: " if default else f"{question}: "
+    return console.input(prompt) or default
+
+def _ask_menu_choice(question: str, choices: list[str], default: str) -> str:
+    """
+    Reads a menu choice with plain input(), re-asking until it is valid.
+    """
+    prompt = f"{question} [magenta][{'/'.join(choices)}][/magenta] [cyan]({default})[/cyan]: "
+    while True:
+        with _completing(choices):
+            value = console.input(prompt).strip() or default
+        if value in choices:
+            return value
+        console.print("[red]Please select one of the available options[/red]")
+
 @app.command()
 def interactive():
     """
     Start the interactive session.
     """
+    from rich.panel import Panel
+    from rich.prompt import Prompt
+    from rich.text import Text
+    
     console.print(Panel.fit("[bold blue]Welcome to Pomodoro Task Manager[/bold blue]", border_style="blue"))
     
+    _recover_interrupted_pomodoro()
+    
     # Startup Summary
     tasks, _ = storage.load_data()
-    today = datetime.now()
+    today_date = datetime.now().date()
+    week_end = today_date + timedelta(days=7)
     due_soon_count = 0
     overdue_count = 0
     
     for t in tasks:
-        if t.status in [TaskStatus.TODO, TaskStatus.IN_PROGRESS] and t.deadline:
-            try:
-                d = datetime.fromisoformat(t.deadline)
-                if d.date() < today.date():
-                    overdue_count += 1
-                elif (d - today).days <= 7:
-                    due_soon_count += 1
-            except ValueError:
-                pass
+        if t.deadline and t.status in _ACTIVE_STATUSES:
+            d = t.parsed_deadline
+            if d is None:
+                continue
+            d = d.date()
+            if d < today_date:
+                overdue_count += 1
+            elif d <= week_end:
+                due_soon_count += 1
                 
     if overdue_count > 0:
         console.print(f"🚨 [bold red]You have {overdue_count} OVERDUE task(s)![/bold red]")
     if due_soon_count > 0:
         console.print(f"📅 [yellow]You have {due_soon_count} task(s) due within 7 days.[/yellow]")
     
+    # The menu never changes, so parse its markup once
+    menu = Text.from_markup("\n".join([
+        "\n[bold]Main Menu[/bold]",
+        "1. [cyan]Ingest Tasks[/cyan] (Brain Dump)",
+        "2. [cyan]List Tasks[/cyan]",
+        "3. [cyan]Start Task[/cyan]",
+        "4. [cyan]Check Progress[/cyan]",
+        "5. [cyan]Archive Completed[/cyan]",
+        "6. [cyan]Mark Task Done[/cyan]",
+        "7. [red]Delete Task[/red]",
+        "8. [magenta]Check GitHub Inbox[/magenta]",
+        "9. [cyan]Sync to GitHub[/cyan]",
+        "10. [yellow]Edit Task(s)[/yellow]",
+        "11. [red]Exit[/red]",
+    ]))
+    menu_choices = [str(i) for i in range(1, 12)]
+    _setup_readline()
+    
     while True:
-        console.print("\n[bold]Main Menu[/bold]")
-        console.print("1. [cyan]Ingest Tasks[/cyan] (Brain Dump)")
-        console.print("2. [cyan]List Tasks[/cyan]")
-        console.print("3. [cyan]Start Task[/cyan]")
-        console.print("4. [cyan]Check Progress[/cyan]")
-        console.print("5. [cyan]Archive Completed[/cyan]")
-        console.print("6. [cyan]Mark Task Done[/cyan]")
-        console.print("7. [red]Delete Task[/red]")
-        console.print("8. [magenta]Check GitHub Inbox[/magenta]")
-        console.print("9. [cyan]Sync to GitHub[/cyan]")
-        console.print("10. [yellow]Edit Task(s)[/yellow]")
-        console.print("11. [red]Exit[/red]")
+        console.print(menu)
         
-        choice = Prompt.ask("What would you like to do?", choices=["1", "2", "3", "4", "5", "6", "7", "8", "9", "10", "11"], default="2")
+        choice = _ask_menu_choice("What would you like to do?", menu_choices, default="2")
         
         if choice == "1":
             text = Prompt.ask("Enter your brain dump")
@@ -1,20 +1,31 @@
-import uuid
+import secrets
+import sys
 from dataclasses import dataclass, field, asdict
 from typing import List, Optional
 from enum import Enum
 from datetime import datetime
 
+# __slots__ instead of a per-instance __dict__ where supported (Python 3.10+)
+_DATACLASS_OPTIONS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
 class TaskStatus(str, Enum):
     TODO = "todo"
     IN_PROGRESS = "in_progress"
     DONE = "done"
     ARCHIVED = "archived"
 
-@dataclass
+_STATUS_BY_VALUE = {s.value: s for s in TaskStatus}
+
+def _new_id() -> str:
+    # 128 random bits as 32 hex chars; same uniqueness as a uuid4, minus the UUID formatting.
+    # Older data keeps its hyphenated uuid4 ids, and both kinds resolve by prefix alike.
+    return secrets.token_hex(16)
+
+@dataclass(**_DATACLASS_OPTIONS)
 class Project:
     name: str
     description: str = ""
-    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = field(default_factory=_new_id)
     created_at: str = field(default_factory=lambda: datetime.now().isoformat())
 
     def to_dict(self):
@@ -24,7 +35,7 @@ class Project:
     def from_dict(cls, data):
         return cls(**data)
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class Task:
     title: str
     description: str = ""
@@ -34,17 +45,46 @@ class Task:
     project_id: str = "default"
     deadline: Optional[str] = None # YYYY-MM-DD
     priority: Optional[str] = None # High, Medium, Low
-    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = field(default_factory=_new_id)
     created_at: str = field(default_factory=lambda: datetime.now().isoformat())
     completed_at: Optional[str] = None
+    # Derived-value caches, not part of the stored task
+    _short_id: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _deadline_cache: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def short_id(self) -> str:
+        # 8-character prefix shown in listings; computed once per task
+        if self._short_id is None:
+            self._short_id = self.id[:8]
+        return self._short_id
+
+    @property
+    def parsed_deadline(self) -> Optional[datetime]:
+        """
+        The deadline as a datetime, or None if it is unset or invalid.
+        Parsed once and re-parsed only if deadline is changed.
+        """
+        cached = self._deadline_cache
+        if cached is not None and cached[0] == self.deadline:
+            return cached[1]
+        try:
+            parsed = datetime.fromisoformat(self.deadline) if self.deadline else None
+        except ValueError:
+            parsed = None
+        self._deadline_cache = (self.deadline, parsed)
+        return parsed
 
     def to_dict(self):
         data = asdict(self)
+        del data['_short_id'], data['_deadline_cache']
         data['status'] = self.status.value
         return data
 
     @classmethod
     def from_dict(cls, data):
-        if 'status' in data:
-            data['status'] = TaskStatus(data['status'])
+        status = data.get('status')
+        if status is not None:
+            # A dict hit is much cheaper than the Enum constructor; unknown values still raise there
+            data['status'] = _STATUS_BY_VALUE.get(status) or TaskStatus(status)
         return cls(**data)
@@ -1,11 +1,23 @@
 import json
 import os
-from typing import List, Dict, Tuple
+from dataclasses import fields
+from datetime import datetime
+from typing import List, Dict, Optional, Tuple
 from models import Task, Project, TaskStatus
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 DATA_DIR = "data"
 TASKS_FILE = os.path.join(DATA_DIR, "tasks.json")
-ARCHIVE_FILE = os.path.join(DATA_DIR, "archive.json")
+# Archived tasks, appended one JSON object per line and never rewritten
+ARCHIVE_LOG_FILE = os.path.join(DATA_DIR, "archive.jsonl")
+INDEX_FILE = os.path.join(DATA_DIR, "index.json")
+ACTIVE_FILE = os.path.join(DATA_DIR, "active.json")
+# tasks.json is written compactly; set POMO_PRETTY=1 to indent it for reading by hand
+PRETTY_JSON = bool(os.getenv("POMO_PRETTY"))
 
 def _ensure_data_dir():
     if not os.path.exists(DATA_DIR):
@@ -15,50 +27,195 @@ def _load_json(filepath: str) -> Dict:
     if not os.path.exists(filepath):
         return {"tasks": [], "projects": []}
     try:
-        with open(filepath, 'r') as f:
-            return json.load(f)
-    except json.JSONDecodeError:
+        with open(filepath, 'rb') as f:
+            raw = f.read()
+        return orjson.loads(raw) if orjson is not None else json.loads(raw)
+    except json.JSONDecodeError: # orjson.JSONDecodeError subclasses it
         return {"tasks": [], "projects": []}
 
+# Only the stored fields; Task's init=False fields are in-memory caches
+_TASK_FIELDS = tuple(f.name for f in fields(Task) if f.init)
+_PROJECT_FIELDS = tuple(f.name for f in fields(Project) if f.init)
+
+def _encode(obj):
+    # Serializes Task/Project straight from their fields, without the
+    # recursive deep copy dataclasses.asdict makes (TaskStatus is a str)
+    if isinstance(obj, Task):
+        return {name: getattr(obj, name) for name in _TASK_FIELDS}
+    if isinstance(obj, Project):
+        return {name: getattr(obj, name) for name in _PROJECT_FIELDS}
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def _dumps(data: Dict, pretty: bool = False) -> bytes:
+    # 2-space indentation, the only one orjson supports, so both backends write the same layout
+    if orjson is not None:
+        option = orjson.OPT_PASSTHROUGH_DATACLASS | (orjson.OPT_INDENT_2 if pretty else 0)
+        return orjson.dumps(data, default=_encode, option=option)
+    if pretty:
+        return json.dumps(data, indent=2, default=_encode).encode()
+    return json.dumps(data, separators=(",", ":"), default=_encode).encode()
+
+# filepath -> (stat key, payload hash) of the last write, to skip no-op saves
+_LAST_WRITE = {}
+
 def _save_json(filepath: str, data: Dict):
+    # Write to a temp file next to the target, then swap it in so a crash
+    # mid-write can never leave a truncated file behind.
+    payload = _dumps(data, PRETTY_JSON)
+    digest = hash(payload)
+    last = _LAST_WRITE.get(filepath)
+    if last is not None and last == (_stat_key(filepath), digest):
+        return # Same bytes as our last write, and nobody has touched the file since
+        
     _ensure_data_dir()
-    with open(filepath, 'w') as f:
-        json.dump(data, f, indent=4)
+    tmp_path = f"{filepath}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(payload)
+    os.replace(tmp_path, filepath)
+    _LAST_WRITE[filepath] = (_stat_key(filepath), digest)
 
-def load_data() -> Tuple[List[Task], List[Project]]:
+def update_task_status(task_id: str, status: TaskStatus, from_status: Optional[TaskStatus] = None) -> bool:
+    """
+    Updates a single task's status on disk without building Task objects.
+    If from_status is given, the task is only updated while it still has that status.
+    Returns False if nothing was updated.
+    """
     data = _load_json(TASKS_FILE)
-    tasks = [Task.from_dict(t) for t in data.get("tasks", [])]
-    projects = [Project.from_dict(p) for p in data.get("projects", [])]
+    for t in data.get("tasks", []):
+        if t.get("id") == task_id:
+            if from_status is not None and t.get("status") != from_status.value:
+                return False
+            t["status"] = status.value
+            _save_json(TASKS_FILE, data)
+            return True
+    return False
+
+def set_active_task(task_id: str):
+    """
+    Records the task whose Pomodoro is running in a tiny sidecar file, so the
+    full tasks.json only has to be written once, when the Pomodoro ends.
+    """
+    _ensure_data_dir()
+    with open(ACTIVE_FILE, 'w') as f:
+        json.dump({"id": task_id, "started": datetime.now().isoformat()}, f)
+
+def clear_active_task():
+    if os.path.exists(ACTIVE_FILE):
+        os.remove(ACTIVE_FILE)
+
+def recover_active_task() -> Optional[str]:
+    """
+    If a previous Pomodoro was interrupted before its final save, marks that
+    task in_progress (unless it has moved on since) and clears the sidecar.
+    Returns the recovered task ID, if any.
+    """
+    if not os.path.exists(ACTIVE_FILE):
+        return None
+    try:
+        with open(ACTIVE_FILE, 'r') as f:
+            task_id = json.load(f).get("id")
+    except (OSError, json.JSONDecodeError):
+        task_id = None
+    recovered = bool(task_id) and update_task_status(task_id, TaskStatus.IN_PROGRESS, from_status=TaskStatus.TODO)
+    clear_active_task()
+    return task_id if recovered else None
+
+# Parsed tasks.json, reused while the file is unchanged on disk (e.g. across
+# commands in interactive mode). Holds (stat_key, task dicts, project dicts):
+# plain field dicts rather than objects, so a task changed but never saved
+# can't leak into what later loads treat as the file's contents.
+_DATA_CACHE = None
+
+def _stat_key(filepath: str):
+    try:
+        st = os.stat(filepath)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+def _build(task_dicts: List[Dict], project_dicts: List[Dict]) -> Tuple[List[Task], List[Project]]:
+    # from_dict stores the parsed status back into its dict, so it gets a copy
+    tasks = [Task.from_dict(dict(t)) for t in task_dicts]
+    projects = [Project.from_dict(dict(p)) for p in project_dicts]
     return tasks, projects
 
+def load_data() -> Tuple[List[Task], List[Project]]:
+    """
+    Loads active tasks and projects.
+    Every call returns new Task/Project objects; the JSON is only re-parsed
+    when the file has changed.
+    """
+    global _DATA_CACHE
+    key = _stat_key(TASKS_FILE)
+    if key is not None and _DATA_CACHE is not None and _DATA_CACHE[0] == key:
+        return _build(_DATA_CACHE[1], _DATA_CACHE[2])
+        
+    data = _load_json(TASKS_FILE)
+    task_dicts = data.get("tasks", [])
+    project_dicts = data.get("projects", [])
+    _DATA_CACHE = (key, task_dicts, project_dicts) if key is not None else None
+    return _build(task_dicts, project_dicts)
+
 def save_data(tasks: List[Task], projects: List[Project]):
+    global _DATA_CACHE
     data = {
-        "tasks": [t.to_dict() for t in tasks],
-        "projects": [p.to_dict() for p in projects]
+        "tasks": tasks, # Serialized by _encode as they are written
+        "projects": projects
     }
+    # Dropped first, so a failed write leaves nothing stale behind
+    _DATA_CACHE = None
     _save_json(TASKS_FILE, data)
+    # What we just wrote is what the next load would parse
+    task_dicts = [_encode(t) for t in tasks]
+    for t in task_dicts:
+        t["status"] = t["status"].value
+    _DATA_CACHE = (_stat_key(TASKS_FILE), task_dicts, [_encode(p) for p in projects])
 
-def load_archive() -> Tuple[List[Task], List[Project]]:
-    data = _load_json(ARCHIVE_FILE)
-    tasks = [Task.from_dict(t) for t in data.get("tasks", [])]
-    projects = [Project.from_dict(p) for p in data.get("projects", [])]
-    return tasks, projects
+def _dumps_line(data) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data, default=_encode, option=orjson.OPT_PASSTHROUGH_DATACLASS) + b"\n"
+    return json.dumps(data, default=_encode).encode() + b"\n"
 
-def save_archive(tasks: List[Task], projects: List[Project]):
-    # When saving archive, we might want to append or overwrite. 
-    # For simplicity, we'll load, append/merge, and save.
-    # But usually, the caller will handle the merging logic.
-    # Here we just save what is passed.
-    data = {
-        "tasks": [t.to_dict() for t in tasks],
-        "projects": [p.to_dict() for p in projects]
-    }
-    _save_json(ARCHIVE_FILE, data)
+def _append_archive_log(tasks_to_archive: List[Task]):
+    _ensure_data_dir()
+    lines = b"".join(_dumps_line(t) for t in tasks_to_archive)
+    with open(ARCHIVE_LOG_FILE, 'ab+') as f:
+        # Start on a fresh line if a previous append was cut short
+        if f.tell() > 0:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                lines = b"\n" + lines
+        f.write(lines)
+        f.flush()
+        os.fsync(f.fileno())
 
 def append_to_archive(tasks_to_archive: List[Task]):
-    archived_tasks, archived_projects = load_archive()
-    archived_tasks.extend(tasks_to_archive)
-    # We might want to also archive projects if they are no longer used in active tasks,
-    # but for now let's just keep projects in active list or duplicate them if needed.
-    # A simple approach: just archive tasks.
-    save_archive(archived_tasks, archived_projects)
+    # O(new tasks): the existing archive is neither read nor rewritten
+    _append_archive_log(tasks_to_archive)
+
+def save_data_and_archive(tasks: List[Task], projects: List[Project], tasks_to_archive: List[Task]):
+    """
+    Moves tasks_to_archive into the archive and saves the remaining active tasks.
+    The archive append is synced to disk first, so an interruption can at worst
+    leave a task in both files, never in neither.
+    """
+    _append_archive_log(tasks_to_archive)
+    save_data(tasks, projects)
+
+def load_index_map() -> Dict[int, str]:
+    """
+    Loads the Index -> Task ID map written by the last 'list'.
+    """
+    if not os.path.exists(INDEX_FILE):
+        return {}
+    try:
+        with open(INDEX_FILE, 'r') as f:
+            # JSON object keys are always strings
+            return {int(k): v for k, v in json.load(f).items()}
+    except (OSError, ValueError):
+        return {}
+
+def save_index_map(index_map: Dict[int, str]):
+    _ensure_data_dir()
+    with open(INDEX_FILE, 'w') as f:
+        json.dump(index_map, f)
@@ -1,7 +1,9 @@
+import math
 import time
+from functools import lru_cache
 from rich.live import Live
 from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, BarColumn, TextColumn
+from rich.progress import Progress, ProgressColumn, SpinnerColumn, BarColumn
 from rich.console import Console
 from rich.layout import Layout
 from rich.align import Align
@@ -10,6 +12,20 @@ from datetime import timedelta
 
 console = Console()
 
+@lru_cache(maxsize=4096)
+def _format_remaining(seconds: int) -> str:
+    # Each second is formatted once; the refreshes in between and later runs are cache hits
+    return str(timedelta(seconds=seconds))
+
+class _RemainingColumn(ProgressColumn):
+    """
+    Time left as H:MM:SS, formatted from the task when Live refreshes
+    rather than pushed in as a field on every tick.
+    """
+    def render(self, task) -> Text:
+        remaining = math.ceil(task.remaining or 0)
+        return Text(_format_remaining(remaining))
+
 def run_timer(minutes: int = 25, task_title: str = "Focus Time"):
     """
     Runs a visual timer for the specified duration.
@@ -22,19 +38,24 @@ def run_timer(minutes: int = 25, task_title: str = "Focus Time"):
         "[progress.description]{task.description}",
         BarColumn(),
         "[progress.percentage]{task.percentage:>3.0f}%",
-        TextColumn("{task.fields[time_remaining]}"),
+        _RemainingColumn(),
     )
     
-    task_id = progress.add_task(f"[bold cyan]{task_title}", total=seconds, time_remaining=str(timedelta(seconds=seconds)))
+    task_id = progress.add_task(f"[bold cyan]{task_title}", total=seconds)
     
     console.print("[dim]Press Ctrl+C to stop timer[/dim]")
     
+    # Track a monotonic deadline instead of counting 1s sleeps, so the timer doesn't drift
+    start = time.monotonic()
+    deadline = start + seconds
     with Live(Panel(progress, title="Pomodoro Timer", border_style="green"), refresh_per_second=4) as live:
-        while not progress.finished:
-            time.sleep(1)
-            progress.advance(task_id, 1)
-            remaining = seconds - progress.tasks[0].completed
-            progress.update(task_id, time_remaining=str(timedelta(seconds=int(remaining))))
+        while True:
+            now = time.monotonic()
+            if now >= deadline:
+                break
+            progress.update(task_id, completed=now - start)
+            time.sleep(min(0.25, deadline - now))
+        progress.update(task_id, completed=seconds)
             
     console.print(f"[bold green]Time's up! {minutes} minutes completed.[/bold green]")
     # Play a sound? (Optional, might be annoying or platform specific. Skip for now)